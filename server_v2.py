@@ -4,160 +4,448 @@ MCP Server: services-agent
 Serveur MCP pour les outils de santé et services administratifs
 
 Compatible avec Azure Voice Live API (MCP natif)
+Transports: JSON-RPC HTTP sur /mcp, et SSE (/sse + /messages) avec MCP_TRANSPORT=sse
 
 Outils:
 - get_health_advice: Conseils santé et symptômes
 - search_exercises: Recherche d'exercices fitness
 - find_pharmacy: Pharmacies de garde
 - get_government_service_info: Démarches administratives
-- create_cv: Génération de CV (contextuel)
+- create_cv: Génération de CV (contextuel, en arrière-plan)
+- get_cv_status: Suivi de la génération de CV
+- batch_execute: Exécution groupée de plusieurs outils
 
 Auteur: WakaCore Team
 Date: 2026-01-30
 """
 
 import os
+import re
+import sys
 import json
+import math
+import time
+import uuid
+import hashlib
+import hmac
+import importlib
+import inspect
+import shutil
+import threading
+import unicodedata
+from collections import namedtuple
+from collections.abc import Mapping
+from contextlib import asynccontextmanager, suppress
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
 from datetime import datetime, timezone
-from flask import Flask, Response, request, jsonify
-from functools import wraps
+from functools import cache, wraps, lru_cache
+import anyio
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, StreamingResponse
 from dotenv import load_dotenv
 
 load_dotenv()
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import jsonschema_rs
+except ImportError:
+    jsonschema_rs = None
+
+try:
+    from redis import Redis
+except ImportError:
+    Redis = None
+
+try:
+    from rq import Queue
+except ImportError:
+    Queue = None
+
+
+# Plafond de threads simultanés pour exécuter les outils synchrones: la boucle d'événements
+# reste libre pour recevoir d'autres requêtes, et le parallélisme vers les API externes
+# (Cosmos DB, Azure Maps...) reste borné. Le CapacityLimiter lui-même est créé dans la boucle
+# (lifespan): les versions d'anyio antérieures à 4.5 refusent de le construire à l'import
+TOOL_POOL = int(os.getenv("MCP_POOL", "32"))
+TOOL_TIMEOUT = float(os.getenv("MCP_TOOL_TIMEOUT", "30"))
+# Jeton des routes d'administration (/cache/clear); routes désactivées s'il est absent
+ADMIN_TOKEN = os.getenv("MCP_ADMIN_TOKEN", "")
+
+
+# =============================================================================
+# SÉRIALISATION JSON
+# =============================================================================
+
+def _json_default(obj):
+    """Sérialisation des types non JSON natifs (mappings en lecture seule, dates...)"""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+
+def _dumps(obj) -> bytes:
+    """Sérialise en JSON UTF-8: orjson (C) si installé, sinon json de la bibliothèque standard"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode()
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_response(obj, status: int = 200) -> Response:
+    return Response(_dumps(obj), status_code=status, media_type="application/json")
+
+
 # =============================================================================
 # MCP SERVER BASE
 # =============================================================================
 
 class MCPServer:
-    def __init__(self, name: str, description: str, version: str = "2.0.0"):
+    def __init__(self, name: str, description: str, version: str = "2.0.0", transport: str = None):
         self.name = name
         self.description = description
         self.version = version
+        # Transport exposé en plus de /mcp: "http" (JSON-RPC seul) ou "sse" (flux /sse + /messages)
+        self.transport = transport or os.getenv("MCP_TRANSPORT", "http")
+        self._sse_sessions = {}
         self.tools = {}
-        self.app = Flask(__name__)
+        self.caches = {}
+        self._task_group = None
+        self._limiter = None
+        self.app = Starlette(lifespan=self._lifespan)
+        self._method_dispatch = {
+            "initialize": self._handle_initialize,
+            "tools/list": self._handle_tools_list,
+            "tools/call": self._handle_tools_call
+        }
+        # Réponse initialize figée: seul l'id de requête est inséré à chaque appel
+        self._init_prefix = b'{"jsonrpc":"2.0","id":'
+        self._init_suffix = b',' + _dumps({
+            "result": {
+                "protocolVersion": "2024-11-05",
+                "serverInfo": {"name": self.name, "version": self.version},
+                "capabilities": {"tools": {"listChanged": False}}
+            }
+        })[1:]
+        self._refresh_tool_payloads()
         self._setup_routes()
+        if self.transport == "sse":
+            self._setup_sse_routes()
+    
+    @asynccontextmanager
+    async def _lifespan(self, app):
+        # Groupe de tâches du processus: les appels d'outils y survivent à l'attente de leur requête
+        self._limiter = anyio.CapacityLimiter(TOOL_POOL)
+        async with anyio.create_task_group() as task_group:
+            self._task_group = task_group
+            yield
+            task_group.cancel_scope.cancel()
     
     def tool(self, name: str, description: str, parameters: dict):
         """Décorateur pour enregistrer un outil MCP"""
         def decorator(func):
+            input_schema = {
+                "type": "object",
+                "properties": parameters.get("properties", {}),
+                "required": parameters.get("required", [])
+            }
             self.tools[name] = {
                 "name": name,
                 "description": description,
-                "inputSchema": {
-                    "type": "object",
-                    "properties": parameters.get("properties", {}),
-                    "required": parameters.get("required", [])
-                },
-                "handler": func
+                "inputSchema": input_schema,
+                "handler": func,
+                # Validateur compilé (Rust); les handlers n'acceptent aucun argument hors schéma
+                "_validator": jsonschema_rs.validator_for({**input_schema, "additionalProperties": False}) if jsonschema_rs else None,
+                # Entrées sérialisées une fois pour toutes (tools/list et /tools)
+                "_encoded": _dumps({"name": name, "description": description, "inputSchema": input_schema}),
+                "_encoded_short": _dumps({"name": name, "description": description})
             }
+            self._refresh_tool_payloads()
             @wraps(func)
             def wrapper(*args, **kwargs):
                 return func(*args, **kwargs)
             return wrapper
         return decorator
     
+    def route(self, path: str, methods=("GET",)):
+        """Décorateur pour ajouter une route HTTP (endpoint Starlette async) à l'application"""
+        def decorator(endpoint):
+            self.app.add_route(path, endpoint, methods=list(methods))
+            return endpoint
+        return decorator
+    
+    def _refresh_tool_payloads(self):
+        """Pré-sérialise les réponses qui dépendent des outils enregistrés (tools/list, /tools, /health, /)"""
+        tools = self.tools.values()
+        self._tools_list_payload = b'{"tools":[' + b",".join(t["_encoded"] for t in tools) + b']}'
+        self._tools_list_short = (
+            b'{"tools":[' + b",".join(t["_encoded_short"] for t in tools) + b'],"count":' + str(len(self.tools)).encode() + b'}'
+        )
+        self._health_bytes = _dumps({
+            "status": "ok",
+            "server": self.name,
+            "version": self.version,
+            "tools_count": len(self.tools)
+        })
+        endpoints = {
+            "mcp": "/mcp (POST)",
+            "health": "/health",
+            "tools": "/tools"
+        }
+        if self.transport == "sse":
+            endpoints["sse"] = "/sse (GET)"
+            endpoints["messages"] = "/messages (POST)"
+        self._index_bytes = _dumps({
+            "name": self.name,
+            "description": self.description,
+            "version": self.version,
+            "endpoints": endpoints,
+            "tools_count": len(self.tools)
+        })
+    
     def _setup_routes(self):
-        @self.app.route("/mcp", methods=["POST"])
-        def mcp_endpoint():
-            return self._handle_mcp_request()
+        @self.route("/mcp", methods=["POST"])
+        async def mcp_endpoint(request: Request):
+            return await self._handle_mcp_request(request)
         
-        @self.app.route("/health", methods=["GET"])
-        def health():
-            return jsonify({
-                "status": "ok",
-                "server": self.name,
-                "version": self.version,
-                "tools_count": len(self.tools)
-            })
+        @self.route("/health")
+        async def health(request: Request):
+            # Sondes de vivacité Container Apps: octets figés, un Response neuf par appel
+            return Response(self._health_bytes, media_type="application/json")
         
-        @self.app.route("/tools", methods=["GET"])
-        def list_tools():
-            tools_list = [{"name": t["name"], "description": t["description"]} for t in self.tools.values()]
-            return jsonify({"tools": tools_list, "count": len(tools_list)})
+        @self.route("/tools")
+        async def list_tools(request: Request):
+            return Response(self._tools_list_short, media_type="application/json")
         
-        @self.app.route("/", methods=["GET"])
-        def index():
-            return jsonify({
-                "name": self.name,
-                "description": self.description,
-                "version": self.version,
-                "endpoints": {
-                    "mcp": "/mcp (POST)",
-                    "health": "/health",
-                    "tools": "/tools"
-                },
-                "tools_count": len(self.tools)
-            })
+        @self.route("/cache/clear", methods=["POST"])
+        async def clear_cache(request: Request):
+            """Vide les caches mémoire du seul worker qui reçoit la requête (ni Redis, ni les autres workers)"""
+            if not ADMIN_TOKEN:
+                return _json_response({"status": "error", "message": "Not found"}, 404)
+            if not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {ADMIN_TOKEN}"):
+                return _json_response({"status": "error", "message": "Unauthorized"}, 401)
+            for cached in self.caches.values():
+                cached.cache_clear()
+            return _json_response({"status": "ok", "scope": "process", "pid": os.getpid(), "cleared": list(self.caches)})
+        
+        @self.route("/cache/stats")
+        async def cache_stats(request: Request):
+            return _json_response({name: cached.cache_info()._asdict() for name, cached in self.caches.items()})
+        
+        @self.route("/")
+        async def index(request: Request):
+            return Response(self._index_bytes, media_type="application/json")
     
-    def _handle_mcp_request(self):
-        data = request.get_json()
-        if not data:
-            return jsonify({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}), 400
+    def _setup_sse_routes(self):
+        """Transport SSE MCP: le client ouvre /sse puis poste ses requêtes sur /messages"""
+        @self.route("/sse")
+        async def sse_stream(request: Request):
+            session_id = uuid.uuid4().hex
+            send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size=math.inf)
+            self._sse_sessions[session_id] = send_stream
+            
+            async def stream():
+                try:
+                    yield f"event: endpoint\ndata: /messages?session_id={session_id}\n\n".encode()
+                    while True:
+                        frame = None
+                        with anyio.move_on_after(15):
+                            frame = await receive_stream.receive()
+                        if frame is None:
+                            # Commentaire keep-alive: évite la coupure par les proxys inactifs
+                            yield b": ping\n\n"
+                            continue
+                        yield b"event: message\ndata: " + frame + b"\n\n"
+                finally:
+                    # Déconnexion du client: Starlette annule le générateur
+                    self._sse_sessions.pop(session_id, None)
+                    send_stream.close()
+                    receive_stream.close()
+            
+            return StreamingResponse(stream(), media_type="text/event-stream", headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"
+            })
         
+        @self.route("/messages", methods=["POST"])
+        async def sse_message(request: Request):
+            outbox = self._sse_sessions.get(request.query_params.get("session_id", ""))
+            if outbox is None:
+                return _json_response({"error": "Session SSE introuvable"}, 404)
+            data = await self._parse_request(request)
+            # Accusé de réception immédiat: la réponse JSON-RPC part ensuite sur le flux /sse
+            return Response(b"Accepted", status_code=202, media_type="text/plain",
+                            background=BackgroundTask(self._reply_sse, outbox, data))
+    
+    async def _reply_sse(self, outbox, data):
+        if data is None:
+            frame = _dumps({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}})
+        elif "id" in data:
+            frame = (await self._dispatch(data)).body
+        else:
+            # Les notifications (sans id) n'appellent pas de réponse
+            return
+        # Client déconnecté pendant l'appel: la réponse n'a plus de destinataire
+        with suppress(anyio.ClosedResourceError, anyio.BrokenResourceError):
+            outbox.send_nowait(frame)
+    
+    async def _parse_request(self, request: Request):
+        try:
+            data = _loads(await request.body())
+        except ValueError:
+            return None
+        return data if data and isinstance(data, dict) else None
+    
+    async def _handle_mcp_request(self, request: Request):
+        data = await self._parse_request(request)
+        if data is None:
+            return _json_response({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}, 400)
+        return await self._dispatch(data)
+    
+    async def _dispatch(self, data: dict) -> Response:
         request_id = data.get("id")
         method = data.get("method", "")
-        params = data.get("params", {})
+        params = data.get("params") or {}
+        # method et params non conformes (liste, objet...): erreur JSON-RPC, pas d'exception
+        if not isinstance(method, str) or not isinstance(params, dict):
+            return self._rpc_error(request_id, -32600, "Invalid Request")
+        handler = self._method_dispatch.get(method)
+        if handler is None:
+            return self._rpc_error(request_id, -32601, f"Method not found: {method}")
+        return await handler(request_id, params)
+    
+    def _rpc_error(self, request_id, code: int, message: str) -> Response:
+        return _json_response({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+    
+    async def _handle_initialize(self, request_id, params: dict) -> Response:
+        return Response(self._init_prefix + _dumps(request_id) + self._init_suffix, media_type="application/json")
+    
+    async def _handle_tools_list(self, request_id, params: dict) -> Response:
+        return Response(
+            b'{"jsonrpc":"2.0","id":' + _dumps(request_id) + b',"result":' + self._tools_list_payload + b'}',
+            media_type="application/json"
+        )
+    
+    async def _handle_tools_call(self, request_id, params: dict) -> Response:
+        tool_name = params.get("name")
+        tool = self.tools.get(tool_name) if isinstance(tool_name, str) else None
+        if tool is None:
+            return self._rpc_error(request_id, -32601, f"Tool not found: {tool_name}")
         
-        if method == "initialize":
-            return jsonify({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "serverInfo": {"name": self.name, "version": self.version},
-                    "capabilities": {"tools": {"listChanged": False}}
-                }
-            })
+        arguments = params.get("arguments") or {}
+        if tool["_validator"] is not None:
+            error = next(tool["_validator"].iter_errors(arguments), None)
+            if error is not None:
+                return self._rpc_error(request_id, -32602, f"Invalid params: {error.message}")
         
-        elif method == "tools/list":
-            tools_list = [{
-                "name": t["name"],
-                "description": t["description"],
-                "inputSchema": t["inputSchema"]
-            } for t in self.tools.values()]
-            return jsonify({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"tools": tools_list}
-            })
+        handler = tool["handler"]
+        try:
+            # Lecture en mémoire (tables pré-calculées): répondue dans la boucle, sans thread
+            lookup = getattr(handler, "__inline__", None)
+            result = lookup(**arguments) if lookup is not None else None
+            if result is None:
+                if inspect.iscoroutinefunction(handler):
+                    # Handler async (batch_execute): s'exécute dans la boucle, ses appels passent par le limiteur
+                    with anyio.fail_after(TOOL_TIMEOUT):
+                        result = await handler(**arguments)
+                else:
+                    result = await self._run_tool(handler, arguments)
+        except TimeoutError:
+            return self._rpc_error(request_id, -32603, f"Tool timeout after {TOOL_TIMEOUT:g}s: {tool_name}")
+        except Exception as e:
+            return self._rpc_error(request_id, -32603, str(e))
         
-        elif method == "tools/call":
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            if tool_name not in self.tools:
-                return jsonify({
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {"code": -32601, "message": f"Tool not found: {tool_name}"}
-                })
-            
+        # Les handlers @precomputed retournent déjà le JSON sérialisé
+        text = result if getattr(handler, "__precomputed__", False) else _dumps(result).decode()
+        # Enveloppe assemblée en octets: le texte n'est encodé (échappé) qu'une seule fois
+        return Response(
+            b'{"jsonrpc":"2.0","id":' + _dumps(request_id)
+            + b',"result":{"content":[{"type":"text","text":' + _dumps(text) + b'}]}}',
+            media_type="application/json"
+        )
+    
+    async def _run_tool(self, handler, arguments: dict):
+        """Exécute un handler synchrone dans un thread borné par le limiteur (MCP_POOL).
+        
+        Au timeout, seule l'attente est abandonnée: le thread garde sa place dans le limiteur
+        jusqu'à sa fin, pour que des appels bloqués ne dépassent pas MCP_POOL.
+        """
+        outcome = {}
+        done = anyio.Event()
+        
+        def call():
+            # Appel resté en file d'attente au-delà du timeout: inutile de l'exécuter
+            if outcome.get("abandoned"):
+                return None
+            return handler(**arguments)
+        
+        async def worker():
             try:
-                result = self.tools[tool_name]["handler"](**arguments)
-                return jsonify({
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [{"type": "text", "text": json.dumps(result, ensure_ascii=False, default=str)}]
-                    }
-                })
+                outcome["result"] = await anyio.to_thread.run_sync(call, limiter=self._limiter)
             except Exception as e:
-                return jsonify({
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {"code": -32603, "message": str(e)}
-                })
+                outcome["error"] = e
+            finally:
+                done.set()
         
-        else:
-            return jsonify({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {"code": -32601, "message": f"Method not found: {method}"}
-            })
+        self._task_group.start_soon(worker)
+        try:
+            with anyio.fail_after(TOOL_TIMEOUT):
+                await done.wait()
+        finally:
+            # Timeout ou annulation de l'attente: un appel encore en file ne sera pas exécuté
+            if not done.is_set():
+                outcome["abandoned"] = True
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
     
-    def run(self, host="0.0.0.0", port=8000):
-        self.app.run(host=host, port=port, threaded=True)
+    def run(self, host="0.0.0.0", port=8000, transport: str = None, app="server_v2:app"):
+        """Démarre uvicorn (uvloop + httptools lorsqu'ils sont installés) avec MCP_WORKERS processus"""
+        transport = transport or self.transport
+        if transport not in ("http", "sse"):
+            raise ValueError(f"Transport inconnu: {transport} (attendu: http ou sse)")
+        # Les workers uvicorn réimportent le module: le transport leur est transmis par l'environnement
+        os.environ["MCP_TRANSPORT"] = transport
+        
+        # Les sessions SSE vivent en mémoire: un seul worker (la boucle multiplexe les connexions)
+        workers = "1" if transport == "sse" else os.getenv("MCP_WORKERS", str(os.cpu_count() or 1))
+        # Remplace le processus courant: uvicorn reçoit directement les signaux du conteneur
+        os.execv(sys.executable, [
+            sys.executable, "-m", "uvicorn",
+            "--host", host,
+            "--port", str(port),
+            "--workers", workers,
+            "--loop", "auto",
+            "--http", "auto",
+            "--app-dir", os.path.dirname(os.path.abspath(__file__)),
+            app
+        ])
+
+
+def precomputed(func):
+    """Marque un handler qui retourne directement le résultat sérialisé en JSON (str)"""
+    func.__precomputed__ = True
+    return func
+
+
+def inline(lookup):
+    """Associe à un handler une lecture en mémoire (mêmes arguments, None si absent) servie sans thread"""
+    def decorator(func):
+        func.__inline__ = lookup
+        return func
+    return decorator
 
 
 # =============================================================================
@@ -170,10 +458,145 @@ server = MCPServer(
     version="2.0.0"
 )
 
-# Import des modules tools
-from tools import tool_health_advice, tool_exercises
-from tools import tool_pharmacy_locator, tool_government_services
-from tools import tool_cv
+# Application ASGI (point d'entrée uvicorn: server_v2:app)
+app = server.app
+
+# Import paresseux des modules tools: un replica qui ne reçoit jamais create_cv ne charge
+# ni python-docx ni le SDK Azure. functools.cache garantit un seul module par nom
+@cache
+def _get_tool(name: str):
+    return importlib.import_module(f"tools.{name}")
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+HEALTH_CACHE_TTL = int(os.getenv("HEALTH_CACHE_TTL", "3600"))
+TOOL_CACHE_TTL = int(os.getenv("TOOL_CACHE_TTL", "3600"))
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+# Second niveau de cache partagé entre réplicas (derrière les lru_cache du processus).
+# Timeouts très courts: en cas de lenteur Redis on exécute l'outil (fail-open).
+_tool_cache_redis = (
+    Redis.from_url(REDIS_URL, socket_timeout=0.05, socket_connect_timeout=0.05) if REDIS_URL and Redis else None
+)
+
+
+def _ttl_slot(ttl: int) -> int:
+    """Fenêtre de temps courante: change toutes les `ttl` secondes pour faire expirer les entrées lru_cache"""
+    return int(time.monotonic() // ttl)
+
+
+def _is_success(result) -> bool:
+    return isinstance(result, Mapping) and result.get("status") == "success"
+
+
+def _shared_cache(name: str, key_parts: tuple, fn, ttl: int = TOOL_CACHE_TTL, cacheable=_is_success):
+    """Lit mcp:<name>:<hash> dans Redis avant d'exécuter fn; les résultats `cacheable` (succès par défaut) sont écrits avec SETEX"""
+    if _tool_cache_redis is None:
+        return fn()
+    
+    key = f"mcp:{name}:{hashlib.blake2b(_dumps(key_parts), digest_size=16).hexdigest()}"
+    try:
+        cached = _tool_cache_redis.get(key)
+        if cached is not None:
+            return _loads(cached)
+    except Exception:
+        pass
+    
+    result = fn()
+    if cacheable(result):
+        try:
+            _tool_cache_redis.setex(key, ttl, _dumps(result))
+        except Exception:
+            pass
+    return result
+
+
+def _canon(s: str) -> str:
+    """Forme canonique d'une saisie vocale (casse, accents, espaces), internée pour des clés de cache partagées"""
+    return sys.intern(unicodedata.normalize("NFKD", s.strip().casefold()).encode("ascii", "ignore").decode())
+
+
+class _Canonical:
+    """Argument de cache comparé sur sa forme canonique, qui conserve la saisie d'origine pour l'outil"""
+    __slots__ = ("key", "raw")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.key = _canon(raw)
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, _Canonical) and self.key == other.key
+
+
+# Appels en cours par clé canonique (singleflight)
+_inflight_lock = threading.Lock()
+_inflight = {}
+
+
+def singleflight(key, fn, *args, **kwargs):
+    """Exécute fn une seule fois pour des appels identiques simultanés: les suivants attendent son résultat"""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result(timeout=TOOL_TIMEOUT)
+    
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+class _NotCached(Exception):
+    """Levée depuis une fonction lru_cache pour retourner un résultat sans le mémoriser"""
+
+    def __init__(self, payload):
+        super().__init__()
+        self.payload = payload
+
+
+_TableInfo = namedtuple("_TableInfo", ["currsize", "ttl"])
+
+
+class _TTLTable:
+    """Table en mémoire remplie à la demande, entrées expirées après `ttl` secondes.
+
+    Expose cache_clear/cache_info comme un lru_cache pour /cache/clear et /cache/stats.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def cache_clear(self):
+        self._entries.clear()
+
+    def cache_info(self) -> _TableInfo:
+        return _TableInfo(len(self._entries), self.ttl)
 
 
 # =============================================================================
@@ -190,10 +613,13 @@ SYMPTÔMES SUPPORTÉS:
 - Fatigue, insomnie
 - Douleurs musculaires
 
+Retourne conseils santé, remèdes naturels et indication de consultation.
+
 ⚠️ AVERTISSEMENT: Conseils généraux uniquement. Consulter un médecin pour tout problème sérieux.""",
     parameters={
         "properties": {
-            "symptoms": {"type": "string", "description": "Description des symptômes ressentis"},
+            # minLength ne retire pas les espaces: le motif exige 3 caractères une fois la saisie nettoyée
+            "symptoms": {"type": "string", "minLength": 3, "pattern": r"\S[\s\S]+\S", "description": "Description des symptômes ressentis (OBLIGATOIRE, minimum 3 caractères). Exemples: \"mal de tête\", \"fièvre depuis 2 jours\", \"toux sèche\""},
             "age": {"type": "integer", "description": "Âge de la personne (pour conseils adaptés)"},
             "sex": {"type": "string", "description": "Sexe ('male' ou 'female')"}
         },
@@ -201,7 +627,36 @@ SYMPTÔMES SUPPORTÉS:
     }
 )
 def get_health_advice(symptoms: str, age: int = 30, sex: str = "male"):
-    return tool_health_advice.get_health_advice(symptoms=symptoms, age=age, sex=sex)
+    # Âge arrondi à la tranche de 5 ans pour augmenter le taux de hit du cache
+    canonical, age_bucket = _Canonical(symptoms), (age // 5) * 5
+    try:
+        return singleflight(
+            ("get_health_advice", canonical.key, age_bucket, sex),
+            _cached_health, canonical, age_bucket, sex, _ttl_slot(HEALTH_CACHE_TTL)
+        )
+    except _NotCached as e:
+        return e.payload
+
+
+def _health_cacheable(result) -> bool:
+    # Conseils génériques après un échec Infermedica: servis, mais jamais mémorisés
+    return _is_success(result) and result.get("source") != "generic_fallback"
+
+
+@lru_cache(maxsize=1024)
+def _cached_health(symptoms: _Canonical, age: int, sex: str, ttl_slot: int):
+    result = _shared_cache(
+        "get_health_advice", (symptoms.key, age, sex),
+        lambda: _get_tool("tool_health_advice").get_health_advice(symptoms=symptoms.raw, age=age, sex=sex),
+        ttl=HEALTH_CACHE_TTL,
+        cacheable=_health_cacheable
+    )
+    if not _health_cacheable(result):
+        raise _NotCached(result)
+    return result
+
+
+server.caches["get_health_advice"] = _cached_health
 
 
 # =============================================================================
@@ -216,7 +671,12 @@ MUSCLES: biceps, triceps, chest, back, legs, abdominals, calves, glutes
 TYPES: cardio, strength, stretching, plyometrics
 NIVEAUX: beginner, intermediate, expert
 
-EXEMPLES: muscle="biceps", difficulty="beginner" """,
+EXEMPLES:
+- muscle="biceps", difficulty="beginner"
+- type="cardio"
+- name="push" (pour push-ups)
+
+Retourne une liste d'exercices avec instructions et équipement.""",
     parameters={
         "properties": {
             "muscle": {"type": "string", "description": "Muscle ciblé (biceps, chest, legs, etc.)"},
@@ -228,21 +688,99 @@ EXEMPLES: muscle="biceps", difficulty="beginner" """,
         "required": []
     }
 )
+@precomputed
 def search_exercises(muscle: str = None, type: str = None, difficulty: str = None, name: str = None, max_results: int = 10):
-    return tool_exercises.search_exercises(muscle=muscle, type=type, difficulty=difficulty, name=name, max_results=max_results)
+    try:
+        return _cached_search(
+            _canon(muscle) if muscle else None,
+            # Pas de mise en minuscules: l'API attend p. ex. "olympicWeightlifting"
+            type.strip() if type else None,
+            _canon(difficulty) if difficulty else None,
+            _canon(name) if name else None,
+            min(max(1, max_results or 10), 30)
+        )
+    except _NotCached as e:
+        return e.payload
+
+
+@lru_cache(maxsize=512)
+def _cached_search(muscle: str, type_: str, difficulty: str, name: str, max_results: int) -> str:
+    result = _shared_cache(
+        "search_exercises", (muscle, type_, difficulty, name, max_results),
+        lambda: _get_tool("tool_exercises").search_exercises(muscle=muscle, type=type_, difficulty=difficulty, name=name, max_results=max_results)
+    )
+    # Valeur en cache sérialisée: immuable, et réutilisée telle quelle par @precomputed
+    payload = _dumps(result).decode()
+    if result.get("status") != "success":
+        # Les erreurs (clé manquante, quota, timeout) ne doivent pas rester en cache
+        raise _NotCached(payload)
+    return payload
+
+
+server.caches["search_exercises"] = _cached_search
 
 
 # =============================================================================
 # PHARMACIES DE GARDE
 # =============================================================================
 
+PHARMACY_CACHE_TTL = int(os.getenv("PHARMACY_CACHE_TTL", "3600"))
+
+# Réponses pré-sérialisées par ville connue × emergency, remplies au premier appel (une seule
+# recherche par ville) et rafraîchies après PHARMACY_CACHE_TTL; rien n'est calculé à l'import
+_PHARMACY_TABLE = _TTLTable(PHARMACY_CACHE_TTL)
+server.caches["find_pharmacy"] = _PHARMACY_TABLE
+
+
+def _pharmacy_key(city: str):
+    """Clé de table d'une ville connue (alias compris), None pour une ville hors liste"""
+    known = _get_tool("tool_pharmacy_locator").normalize_city_name(city)
+    return _canon(known) if known else None
+
+
+def _pharmacy_lookup(city: str = "Ouagadougou", emergency: bool = False):
+    key = _pharmacy_key(city)
+    return _PHARMACY_TABLE.get((key, bool(emergency))) if key else None
+
+
+def _pharmacy_cacheable(result) -> bool:
+    # Repli sur la base locale après un échec Azure Maps: servi, mais jamais mémorisé
+    return _is_success(result) and result.get("source") != "local_fallback"
+
+
+def _load_pharmacies(city: str, key: str) -> dict:
+    """Recherche la ville une seule fois; la variante emergency n'ajoute que les numéros fixes"""
+    tool = _get_tool("tool_pharmacy_locator")
+    result = _shared_cache("find_pharmacy", (key,), lambda: tool.execute({"city": city}), cacheable=_pharmacy_cacheable)
+    variants = {
+        False: _dumps(result).decode(),
+        True: _dumps(tool.add_emergency_numbers(result) if _is_success(result) else result).decode()
+    }
+    # Villes hors liste non mémorisées: la table reste bornée
+    if _pharmacy_cacheable(result) and _pharmacy_key(city):
+        for emergency, payload in variants.items():
+            _PHARMACY_TABLE.put((key, emergency), payload)
+    return variants
+
+
 @server.tool(
     name="find_pharmacy",
     description="""Trouve les pharmacies de garde (24h/24) et numéros d'urgence au Burkina Faso.
 
-VILLES SUPPORTÉES: Ouagadougou, Bobo-Dioulasso, Koudougou, Ouahigouya, Banfora
+VILLES SUPPORTÉES:
+- Ouagadougou
+- Bobo-Dioulasso
+- Koudougou
+- Ouahigouya
+- Banfora
+- Fada N'Gourma
+
+NUMÉROS D'URGENCE:
+- Police: 17
+- Pompiers: 18
+- SAMU: 112
 
-NUMÉROS D'URGENCE: Police: 17, Pompiers: 18, SAMU: 112""",
+Retourne la liste des pharmacies avec adresses et téléphones.""",
     parameters={
         "properties": {
             "city": {"type": "string", "description": "Ville du Burkina (défaut: Ouagadougou)"},
@@ -251,14 +789,51 @@ NUMÉROS D'URGENCE: Police: 17, Pompiers: 18, SAMU: 112""",
         "required": []
     }
 )
+@precomputed
+@inline(_pharmacy_lookup)
 def find_pharmacy(city: str = "Ouagadougou", emergency: bool = False):
-    return tool_pharmacy_locator.execute({"city": city, "emergency": emergency})
+    cached = _pharmacy_lookup(city, emergency)
+    if cached is not None:
+        return cached
+    key = _pharmacy_key(city) or _canon(city)
+    return singleflight(("find_pharmacy", key), _load_pharmacies, city, key)[bool(emergency)]
 
 
 # =============================================================================
 # SERVICES GOUVERNEMENTAUX
 # =============================================================================
 
+# Alias courants → nom du service dans tool_government_services.ADMINISTRATIVE_SERVICES
+_GOV_ALIASES = {
+    "passport": "Passeport",
+    "cnib": "Carte d'identité nationale (CNIB)",
+    "cni": "Carte d'identité nationale (CNIB)",
+    "carte d'identite": "Carte d'identité nationale (CNIB)",
+    "carte identite": "Carte d'identité nationale (CNIB)",
+    "carte d'identite nationale": "Carte d'identité nationale (CNIB)",
+    "id card": "Carte d'identité nationale (CNIB)",
+    "permis": "Permis de conduire",
+    "permis conduire": "Permis de conduire",
+    "license": "Permis de conduire",
+    "acte naissance": "Acte de naissance",
+    "nationalite": "Certificat de nationalité",
+    "certificat nationalite": "Certificat de nationalité",
+    "casier": "Casier judiciaire",
+    "immatriculation": "Immatriculation véhicule",
+    "carte grise": "Immatriculation véhicule"
+}
+
+# Réponses figées par service, calculées au chargement (lecture seule)
+_GOV_RESPONSES = {
+    service: MappingProxyType(_get_tool("tool_government_services").execute({"service": service}))
+    for service in [*_get_tool("tool_government_services").ADMINISTRATIVE_SERVICES, "all"]
+}
+_GOV_TABLE = {
+    **{_canon(service): response for service, response in _GOV_RESPONSES.items()},
+    **{_canon(alias): _GOV_RESPONSES[service] for alias, service in _GOV_ALIASES.items()}
+}
+
+
 @server.tool(
     name="get_government_service_info",
     description="""Informations sur les démarches administratives au Burkina Faso.
@@ -270,23 +845,116 @@ SERVICES DISPONIBLES:
 - Acte de naissance
 - Certificat de nationalité
 - Casier judiciaire
+- Carte grise (immatriculation)
 
-Retourne documents requis, procédure, coûts et délais.""",
+INFORMATIONS FOURNIES:
+- Documents requis
+- Procédure étape par étape
+- Coûts et délais
+- Adresses et contacts""",
     parameters={
         "properties": {
-            "service_name": {"type": "string", "description": "Nom du service (ex: 'Passeport', 'CNIB', 'Permis')"}
+            "service_name": {"type": "string", "minLength": 2, "pattern": r"\S[\s\S]*\S", "description": "Nom du service OBLIGATOIRE. Valeurs acceptées: \"Passeport\", \"CNIB\", \"Permis de conduire\", \"Acte de naissance\", \"Certificat de nationalité\", \"Casier judiciaire\", \"Carte grise\""}
         },
         "required": ["service_name"]
     }
 )
+@inline(lambda service_name: _GOV_TABLE.get(_canon(service_name)))
 def get_government_service_info(service_name: str):
-    return tool_government_services.execute({"service_name": service_name})
+    key = _canon(service_name)
+    cached = _GOV_TABLE.get(key)
+    if cached is not None:
+        return cached
+    return singleflight(
+        ("get_government_service_info", key),
+        _shared_cache, "get_government_service_info", (key,),
+        lambda: _get_tool("tool_government_services").execute({"service": service_name})
+    )
 
 
 # =============================================================================
 # GÉNÉRATION DE CV
 # =============================================================================
 
+# Téléchargement /cv/<id>: CV_SPOOL_DIR doit être un volume partagé par tous les réplicas et le worker RQ
+# (p. ex. partage Azure Files), et PUBLIC_BASE_URL l'URL publique du service. Sans les deux,
+# aucun lien n'est retourné: le CV est remis uniquement par email
+CV_SPOOL_DIR = os.getenv("CV_SPOOL_DIR", "")
+CV_FILE_TTL = int(os.getenv("CV_FILE_TTL", "86400"))
+PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "").rstrip("/")
+CV_DOWNLOADS = bool(CV_SPOOL_DIR and PUBLIC_BASE_URL)
+# Redis de la file CV, distinct de REDIS_URL (cache): activer le cache ne doit pas envoyer
+# les CV vers une file sans worker
+CV_QUEUE_URL = os.getenv("CV_QUEUE_URL", "")
+CV_RESULT_TTL = int(os.getenv("CV_RESULT_TTL", "3600"))
+
+# File RQ "cv" si CV_QUEUE_URL est configuré (worker à déployer: `rq worker cv --url $CV_QUEUE_URL`
+# depuis ce répertoire, avec le même CV_SPOOL_DIR), sinon génération en arrière-plan dans le processus courant
+_cv_queue = Queue("cv", connection=Redis.from_url(CV_QUEUE_URL)) if CV_QUEUE_URL and Redis and Queue else None
+_cv_local_pool = ThreadPoolExecutor(max_workers=int(os.getenv("CV_WORKERS", "2")), thread_name_prefix="cv")
+
+# État des jobs exécutés dans le processus, lisible par tous les workers pour get_cv_status:
+# Redis (REDIS_URL) si configuré, sinon fichiers JSON dans CV_JOBS_DIR (volume partagé entre
+# réplicas, ou au moins entre les workers d'un conteneur); à défaut, mémoire du seul processus
+CV_JOBS_DIR = os.getenv("CV_JOBS_DIR", os.path.join(CV_SPOOL_DIR, "jobs") if CV_SPOOL_DIR else "")
+_cv_state_redis = Redis.from_url(REDIS_URL) if REDIS_URL and Redis else None
+CV_SHARED_JOB_STATE = bool(_cv_queue is not None or _cv_state_redis is not None or CV_JOBS_DIR)
+_cv_local_jobs = {}
+_cv_local_jobs_lock = threading.Lock()
+
+
+def _save_cv_job(job_id: str, state: dict):
+    """Enregistre l'état d'un job local; conservé CV_RESULT_TTL secondes (équivalent du result_ttl RQ)"""
+    if _cv_state_redis is not None:
+        _cv_state_redis.setex(f"mcp:cv_job:{job_id}", CV_RESULT_TTL, _dumps(state))
+    elif CV_JOBS_DIR:
+        os.makedirs(CV_JOBS_DIR, exist_ok=True)
+        expired = time.time() - CV_RESULT_TTL
+        for entry in os.scandir(CV_JOBS_DIR):
+            with suppress(FileNotFoundError):
+                if entry.stat().st_mtime < expired:
+                    os.remove(entry.path)
+        path = os.path.join(CV_JOBS_DIR, f"{job_id}.json")
+        # Écriture atomique: un lecteur ne voit jamais un fichier à moitié écrit
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(_dumps(state))
+        os.replace(f"{path}.tmp", path)
+    else:
+        expired = time.monotonic() - CV_RESULT_TTL
+        with _cv_local_jobs_lock:
+            for old_id, (saved_at, _) in list(_cv_local_jobs.items()):
+                if saved_at < expired:
+                    del _cv_local_jobs[old_id]
+            _cv_local_jobs[job_id] = (time.monotonic(), state)
+
+
+def _load_cv_job(job_id: str):
+    if _cv_state_redis is not None:
+        data = _cv_state_redis.get(f"mcp:cv_job:{job_id}")
+        return _loads(data) if data is not None else None
+    if CV_JOBS_DIR:
+        # job_id fourni par le client: uniquement l'identifiant hexadécimal généré par create_cv
+        if not re.fullmatch(r"[0-9a-f]{32}", job_id):
+            return None
+        try:
+            with open(os.path.join(CV_JOBS_DIR, f"{job_id}.json"), "rb") as f:
+                return _loads(f.read())
+        except FileNotFoundError:
+            return None
+    entry = _cv_local_jobs.get(job_id)
+    return entry[1] if entry else None
+
+
+def _run_cv_local_job(job_id: str, call_id: str, email: str, style: str, color: str):
+    _save_cv_job(job_id, {"status": "started"})
+    try:
+        result = _create_cv_job(call_id, email, style, color)
+    except Exception:
+        _save_cv_job(job_id, {"status": "failed"})
+        raise
+    _save_cv_job(job_id, {"status": "finished", "result": result})
+
+
 @server.tool(
     name="create_cv",
     description="""Génère un CV professionnel Word à partir de la conversation Voice Live.
@@ -296,7 +964,10 @@ def get_government_service_info(service_name: str):
 - Expériences professionnelles
 - Formations et Compétences
 
-Le CV est généré depuis l'historique de conversation et envoyé par email.""",
+Le CV est généré en arrière-plan depuis l'historique de conversation stocké dans Cosmos DB
+et envoyé par email.
+Retourne immédiatement un job_id: utiliser get_cv_status pour suivre la génération
+et, si le téléchargement est activé, obtenir l'URL du document (usage unique, valable 24h).""",
     parameters={
         "properties": {
             "call_id": {"type": "string", "description": "ID de l'appel Voice Live en cours (fourni automatiquement)"},
@@ -308,7 +979,198 @@ Le CV est généré depuis l'historique de conversation et envoyé par email."""
     }
 )
 def create_cv(call_id: str, email: str, style: str = "moderne", color: str = "bleu"):
-    return tool_cv.create_cv(call_id=call_id, email=email, style=style, color=color)
+    if _cv_queue is not None:
+        job_id = _cv_queue.enqueue(_create_cv_job, call_id, email, style, color, job_timeout=300, result_ttl=CV_RESULT_TTL).id
+    else:
+        job_id = uuid.uuid4().hex
+        _save_cv_job(job_id, {"status": "queued"})
+        _cv_local_pool.submit(_run_cv_local_job, job_id, call_id, email, style, color)
+    return {
+        "status": "queued",
+        "job_id": job_id,
+        "message": f"Génération du CV en cours. Il sera envoyé à {email} dans quelques instants."
+    }
+
+
+@server.tool(
+    name="get_cv_status",
+    description="""Suit la génération d'un CV lancée par create_cv.
+
+Retourne le statut (queued, started, finished, failed) et, une fois terminé, le résultat avec l'URL de téléchargement.""",
+    parameters={
+        "properties": {
+            "job_id": {"type": "string", "description": "Identifiant retourné par create_cv"}
+        },
+        "required": ["job_id"]
+    }
+)
+def get_cv_status(job_id: str):
+    if _cv_queue is not None:
+        job = _cv_queue.fetch_job(job_id)
+        status = job.get_status().value if job else None
+        result = job.result if status == "finished" else None
+    else:
+        state = _load_cv_job(job_id) or {}
+        status, result = state.get("status"), state.get("result")
+    
+    if status is None:
+        return {"status": "error", "message": f"Génération de CV introuvable: {job_id}"}
+    if status == "finished":
+        return result
+    if status == "failed":
+        return {"status": "error", "job_id": job_id, "message": "La génération du CV a échoué"}
+    return {"status": status, "job_id": job_id}
+
+
+def _create_cv_job(call_id: str, email: str, style: str, color: str) -> dict:
+    """Génération effective du CV (exécutée par le worker RQ ou le pool local)"""
+    result = _get_tool("tool_cv").create_cv(call_id=call_id, email=email, style=style, color=color, keep_file=CV_DOWNLOADS)
+    file_path = result.pop("file_path", None)
+    if file_path:
+        # Le document reste sur disque: la réponse MCP ne transporte que son URL
+        result["url"] = _spool_cv(file_path)
+        result.pop("cv_preview", None)
+    return result
+
+
+def _spool_cv(file_path: str) -> str:
+    """Déplace le CV dans le répertoire de téléchargement et retourne son URL /cv/<id>"""
+    os.makedirs(CV_SPOOL_DIR, exist_ok=True)
+    expired = time.time() - CV_FILE_TTL
+    for entry in os.scandir(CV_SPOOL_DIR):
+        # Fichier déjà supprimé par un autre job ou par un téléchargement en cours
+        with suppress(FileNotFoundError):
+            if entry.is_file() and entry.stat().st_mtime < expired:
+                os.remove(entry.path)
+    
+    cv_id = uuid.uuid4().hex
+    shutil.move(file_path, os.path.join(CV_SPOOL_DIR, f"{cv_id}.docx"))
+    return f"{PUBLIC_BASE_URL}/cv/{cv_id}"
+
+
+async def download_cv(request: Request):
+    """Téléchargement unique du CV: le fichier est supprimé après envoi"""
+    cv_id = request.path_params["cv_id"]
+    try:
+        if not re.fullmatch(r"[0-9a-f]{32}", cv_id):
+            raise FileNotFoundError(cv_id)
+        path = os.path.join(CV_SPOOL_DIR, f"{cv_id}.docx")
+        # Renommage atomique: une seule requête peut réclamer le fichier
+        sending = f"{path}.{uuid.uuid4().hex}.sending"
+        os.rename(path, sending)
+    except FileNotFoundError:
+        return _json_response({"status": "error", "message": "CV introuvable ou déjà téléchargé"}, 404)
+    
+    return FileResponse(
+        sending,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        filename=f"CV_{cv_id[:8]}.docx",
+        background=BackgroundTask(os.remove, sending)
+    )
+
+
+if CV_DOWNLOADS:
+    server.route("/cv/{cv_id}")(download_cv)
+
+
+# =============================================================================
+# BATCH
+# =============================================================================
+
+BATCH_MAX_CALLS = 32
+BATCH_MAX_CONCURRENT = 16
+# Échéance des appels du batch, plus courte que celle de l'appel englobant (MCP_TOOL_TIMEOUT)
+# pour que les résultats partiels reviennent avant son expiration
+BATCH_TIMEOUT = float(os.getenv("MCP_BATCH_TIMEOUT", str(TOOL_TIMEOUT * 0.8)))
+
+
+@server.tool(
+    name="batch_execute",
+    description="""Exécute plusieurs outils en une seule requête, en parallèle.
+
+EXEMPLE: calls=[{"name": "find_pharmacy", "arguments": {"city": "Ouagadougou"}}, {"name": "get_government_service_info", "arguments": {"service_name": "CNIB"}}]
+
+Retourne un résultat par appel, dans le même ordre: {"ok": true, "value": ...} ou {"ok": false, "error": "..."}""",
+    parameters={
+        "properties": {
+            "calls": {
+                "type": "array",
+                "description": f"Liste des appels d'outils ({{name, arguments}}), {BATCH_MAX_CALLS} au maximum",
+                "maxItems": BATCH_MAX_CALLS,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "arguments": {"type": "object"}
+                    },
+                    "required": ["name"]
+                }
+            },
+            "maxConcurrent": {"type": "integer", "minimum": 1, "maximum": BATCH_MAX_CONCURRENT, "description": f"Nombre maximum d'appels simultanés (défaut: 8, maximum: {BATCH_MAX_CONCURRENT})"},
+            "stopOnError": {"type": "boolean", "description": "Si true, annule les appels restants à la première erreur"}
+        },
+        "required": ["calls"]
+    }
+)
+@precomputed
+async def batch_execute(calls: list, maxConcurrent: int = 8, stopOnError: bool = False):
+    items = [None] * len(calls)
+    # maxConcurrent borne le batch; chaque appel prend en plus sa place dans le limiteur du serveur
+    # (MCP_POOL), comme un appel tools/call isolé: aucun thread hors plafond
+    concurrency = anyio.Semaphore(max(1, maxConcurrent or 8))
+    stopped = False
+    
+    async def run(index: int, name: str, arguments: dict):
+        nonlocal stopped
+        async with concurrency:
+            if stopped:
+                items[index] = _batch_error("Cancelled")
+                return
+            try:
+                items[index] = '{"ok":true,"value":' + await _run_batch_call(name, arguments) + '}'
+            except TimeoutError:
+                items[index] = _batch_error(f"Tool timeout after {TOOL_TIMEOUT:g}s: {name}")
+            except Exception as e:
+                items[index] = _batch_error(str(e))
+                if stopOnError:
+                    stopped = True
+    
+    # À l'échéance, les appels restants sont abandonnés et le batch répond avec les résultats partiels
+    with anyio.move_on_after(BATCH_TIMEOUT):
+        async with anyio.create_task_group() as task_group:
+            for index, call in enumerate(calls):
+                name = call.get("name")
+                if name not in server.tools or name == "batch_execute":
+                    items[index] = _batch_error(f"Tool not found: {name}")
+                    continue
+                task_group.start_soon(run, index, name, call.get("arguments") or {})
+    
+    for index, item in enumerate(items):
+        if item is None:
+            items[index] = _batch_error(f"Tool timeout after {BATCH_TIMEOUT:g}s: {calls[index].get('name')}")
+    return '{"results":[' + ",".join(items) + ']}'
+
+
+async def _run_batch_call(name: str, arguments: dict) -> str:
+    """Exécute un appel du batch et retourne son résultat sérialisé une seule fois"""
+    tool = server.tools[name]
+    if tool["_validator"] is not None:
+        error = next(tool["_validator"].iter_errors(arguments), None)
+        if error is not None:
+            raise ValueError(f"Invalid params: {error.message}")
+    
+    handler = tool["handler"]
+    lookup = getattr(handler, "__inline__", None)
+    result = lookup(**arguments) if lookup is not None else None
+    if result is None:
+        result = await server._run_tool(handler, arguments)
+    if getattr(handler, "__precomputed__", False):
+        return result
+    return _dumps(result).decode()
+
+
+def _batch_error(message: str) -> str:
+    return '{"ok":false,"error":' + _dumps(message).decode() + '}'
 
 
 # =============================================================================
@@ -317,4 +1179,8 @@ def create_cv(call_id: str, email: str, style: str = "moderne", color: str = "bl
 
 if __name__ == "__main__":
     print("🏥 Démarrage du serveur MCP services-agent v2.0.0...")
+    workers = 1 if server.transport == "sse" else int(os.getenv("MCP_WORKERS", str(os.cpu_count() or 1)))
+    if workers > 1 and not CV_SHARED_JOB_STATE:
+        # Jobs CV en mémoire d'un seul worker: get_cv_status répondrait "introuvable" depuis les autres
+        sys.exit("❌ Plusieurs workers sans état CV partagé: définir CV_JOBS_DIR, REDIS_URL ou CV_QUEUE_URL (ou MCP_WORKERS=1)")
     server.run(host="0.0.0.0", port=8000)
@@ -535,7 +535,7 @@ def send_cv_email(email, word_file_path):
         }
 
 
-def create_cv(call_id, email, style="moderne", color="bleu"):
+def create_cv(call_id, email, style="moderne", color="bleu", keep_file=False):
     """
     Génère un CV à partir de l'historique de conversation Voice Live.
     
@@ -544,6 +544,7 @@ def create_cv(call_id, email, style="moderne", color="bleu"):
         email: Adresse email de destination
         style: Style du CV (classique, moderne, minimaliste)
         color: Couleur du CV (bleu, vert, gris, rouge)
+        keep_file: Si True, conserve le fichier Word et retourne son chemin ("file_path")
     
     Returns:
         dict: Résultat avec status et détails
@@ -597,15 +598,16 @@ def create_cv(call_id, email, style="moderne", color="bleu"):
         print(f"📧 Envoi par email à {email}...")
         email_result = send_cv_email(email, word_file_path)
         
-        # Supprimer le fichier temporaire
-        try:
-            os.remove(word_file_path)
-            print(f"🗑️ Fichier temporaire supprimé: {word_file_path}")
-        except:
-            pass
+        # Supprimer le fichier temporaire (sauf si l'appelant le récupère)
+        if not keep_file:
+            try:
+                os.remove(word_file_path)
+                print(f"🗑️ Fichier temporaire supprimé: {word_file_path}")
+            except:
+                pass
         
         if email_result.get('status') == 'success':
-            return {
+            result = {
                 "status": "success",
                 "message": f"✅ CV généré et envoyé avec succès à {email}. Vérifiez votre boîte de réception (et spam).",
                 "call_id": call_id,
@@ -616,7 +618,7 @@ def create_cv(call_id, email, style="moderne", color="bleu"):
                 "cv_preview": markdown_cv[:300] + "..." if len(markdown_cv) > 300 else markdown_cv
             }
         else:
-            return {
+            result = {
                 "status": "partial_success",
                 "message": f"CV généré mais échec de l'envoi email: {email_result.get('message')}",
                 "call_id": call_id,
@@ -624,6 +626,10 @@ def create_cv(call_id, email, style="moderne", color="bleu"):
                 "email": email
             }
         
+        if keep_file:
+            result["file_path"] = word_file_path
+        return result
+        
     except Exception as e:
         import traceback
         traceback.print_exc()
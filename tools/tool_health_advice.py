@@ -89,7 +89,7 @@ def get_health_advice(symptoms, age=30, sex="male"):
         )
         
         if parse_response.status_code != 200:
-            return get_generic_health_advice(symptoms)
+            return get_fallback_health_advice(symptoms)
         
         parsed_data = parse_response.json()
         mentioned_symptoms = parsed_data.get("mentions", [])
@@ -122,7 +122,7 @@ def get_health_advice(symptoms, age=30, sex="male"):
         )
         
         if diagnosis_response.status_code != 200:
-            return get_generic_health_advice(symptoms)
+            return get_fallback_health_advice(symptoms)
         
         diagnosis_data = diagnosis_response.json()
         conditions = diagnosis_data.get("conditions", [])
@@ -147,12 +147,26 @@ def get_health_advice(symptoms, age=30, sex="male"):
             },
             "possible_conditions": possible_conditions,
             "advice": advice,
-            "disclaimer": "⚠️ Ces conseils sont informatifs. Consultez un médecin pour un diagnostic précis."
+            "disclaimer": "⚠️ Ces conseils sont informatifs. Consultez un médecin pour un diagnostic précis.",
+            "source": "infermedica"
         }
         
     except Exception as e:
         # En cas d'erreur, utiliser les conseils génériques
-        return get_generic_health_advice(symptoms)
+        return get_fallback_health_advice(symptoms)
+
+
+def get_fallback_health_advice(symptoms):
+    """
+    Conseils génériques servis après un échec de l'API Infermedica (erreur réseau, statut non 200).
+    
+    Args:
+        symptoms: Description des symptômes
+    
+    Returns:
+        dict: Conseils génériques marqués "source": "generic_fallback" (à ne pas mettre en cache)
+    """
+    return {**get_generic_health_advice(symptoms), "source": "generic_fallback"}
 
 
 def get_generic_health_advice(symptoms):
@@ -255,7 +269,8 @@ def get_generic_health_advice(symptoms):
                 ]
             },
             "disclaimer": "⚠️ Ces conseils sont généraux. Consultez un professionnel de santé pour un diagnostic précis.",
-            "note": "Pour des conseils plus précis, configurez INFERMEDICA_APP_ID et INFERMEDICA_APP_KEY dans .env"
+            "note": "Pour des conseils plus précis, configurez INFERMEDICA_APP_ID et INFERMEDICA_APP_KEY dans .env",
+            "source": "generic"
         }
     
     return {
@@ -273,7 +288,8 @@ def get_generic_health_advice(symptoms):
             "Perte de conscience",
             "Saignement important"
         ],
-        "disclaimer": "⚠️ Ces conseils sont informatifs. Consultez un médecin si les symptômes persistent ou s'aggravent."
+        "disclaimer": "⚠️ Ces conseils sont informatifs. Consultez un médecin si les symptômes persistent ou s'aggravent.",
+        "source": "generic"
     }
 
 
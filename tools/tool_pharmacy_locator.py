@@ -28,6 +28,13 @@ BURKINA_CITIES = {
     "Fada N'Gourma": {"lat": 12.0614, "lon": 0.3556}
 }
 
+# Noms abrégés des villes (usage courant à l'oral)
+CITY_ALIASES = {
+    "ouaga": "Ouagadougou",
+    "bobo": "Bobo-Dioulasso",
+    "fada": "Fada N'Gourma"
+}
+
 # Numéros d'urgence Burkina Faso
 EMERGENCY_NUMBERS = {
     "Police": "17",
@@ -128,6 +135,23 @@ DEFAULT: false""",
     }
 
 
+def normalize_city_name(city_name):
+    """
+    Normalise le nom d'une ville (casse, espaces, noms abrégés)
+    
+    Args:
+        city_name: Nom de la ville tel que fourni
+    
+    Returns:
+        str: Nom canonique de la ville ou None si non reconnue
+    """
+    key = city_name.strip().casefold()
+    for name in BURKINA_CITIES:
+        if name.casefold() == key:
+            return name
+    return CITY_ALIASES.get(key)
+
+
 def search_pharmacies_azure_maps(city_name):
     """
     Recherche de pharmacies via Azure Maps
@@ -144,7 +168,7 @@ def search_pharmacies_azure_maps(city_name):
             return []
         
         # Normaliser ville
-        city_normalized = city_name.replace("Ouaga", "Ouagadougou").replace("Bobo", "Bobo-Dioulasso").replace("Fada", "Fada N'Gourma")
+        city_normalized = normalize_city_name(city_name)
         
         if city_normalized not in BURKINA_CITIES:
             logger.warning(f"⚠️ Ville non reconnue: {city_name}")
@@ -200,7 +224,7 @@ def get_local_pharmacies(city_name):
         list: Liste de pharmacies
     """
     # Normaliser ville
-    city_normalized = city_name.replace("Ouaga", "Ouagadougou").replace("Bobo", "Bobo-Dioulasso").replace("Fada", "Fada N'Gourma")
+    city_normalized = normalize_city_name(city_name)
     
     if city_normalized not in PHARMACIES_DE_GARDE:
         logger.warning(f"⚠️ Pas de pharmacies dans la base pour: {city_name}, utilisation Ouagadougou")
@@ -209,6 +233,27 @@ def get_local_pharmacies(city_name):
     return PHARMACIES_DE_GARDE[city_normalized]
 
 
+def add_emergency_numbers(result):
+    """
+    Ajoute les numéros d'urgence à un résultat de recherche
+    
+    Args:
+        result: Résultat de execute() sans numéros d'urgence
+    
+    Returns:
+        dict: Copie du résultat avec numéros d'urgence et message complété
+    """
+    urgence_text = "\n\n".join([
+        f"🚨 {service}: {number}"
+        for service, number in EMERGENCY_NUMBERS.items()
+    ])
+    return {
+        **result,
+        "emergency_numbers": EMERGENCY_NUMBERS,
+        "message": result["message"] + f"\n\n🆘 NUMÉROS D'URGENCE:\n\n{urgence_text}"
+    }
+
+
 def execute(arguments):
     """
     Exécute la recherche de pharmacies de garde
@@ -229,10 +274,12 @@ def execute(arguments):
     try:
         # Essayer Azure Maps d'abord
         pharmacies = search_pharmacies_azure_maps(city)
+        source = "azure_maps"
         
-        # Fallback sur base locale si Azure Maps échoue
+        # Fallback sur base locale si Azure Maps échoue (ou n'est pas configuré)
         if not pharmacies:
             pharmacies = get_local_pharmacies(city)
+            source = "local_fallback" if AZURE_MAPS_SUBSCRIPTION_KEY else "local"
         
         if not pharmacies:
             return {
@@ -241,7 +288,7 @@ def execute(arguments):
             }
         
         # Formater le message
-        city_display = city.replace("Ouaga", "Ouagadougou").replace("Bobo", "Bobo-Dioulasso")
+        city_display = normalize_city_name(city) or city
         
         pharmacies_text = "\n\n".join([
             f"📍 {p['name']}\n   Adresse: {p['address']}\n   Téléphone: {p['phone']}\n   Horaires: {p['hours']}"
@@ -250,22 +297,18 @@ def execute(arguments):
         
         message = f"🏥 Pharmacies de garde à {city_display}:\n\n{pharmacies_text}"
         
-        # Ajouter numéros d'urgence si demandé
-        if emergency:
-            urgence_text = "\n\n".join([
-                f"🚨 {service}: {number}"
-                for service, number in EMERGENCY_NUMBERS.items()
-            ])
-            message += f"\n\n🆘 NUMÉROS D'URGENCE:\n\n{urgence_text}"
-        
-        return {
+        result = {
             "status": "success",
             "city": city_display,
             "pharmacies": pharmacies[:5],
-            "emergency_numbers": EMERGENCY_NUMBERS if emergency else None,
+            "source": source,
+            "emergency_numbers": None,
             "message": message
         }
         
+        # Ajouter numéros d'urgence si demandé
+        return add_emergency_numbers(result) if emergency else result
+        
     except Exception as e:
         logger.exception(f"❌ Erreur recherche pharmacies: {str(e)}")
         return {